@@ -1,39 +1,122 @@
+import os
 import re
 from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+from pathlib import Path
 from typing import List, Dict, Tuple
 import numpy as np
 from langdetect import detect
-import pandas as pd
+
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+
+# fastText language identification model, used instead of langdetect when available
+# (https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.ftz)
+FASTTEXT_MODEL = Path(__file__).parent / 'lid.176.ftz'
+
+# Sentences shorter than this are too unreliable to detect
+MIN_DETECT_CHARS = 15
+# Longer sentences are truncated; a prefix is enough to identify the language
+MAX_DETECT_CHARS = 1000
+# Sentences sharing this many leading characters are assumed to share a language
+DETECT_KEY_CHARS = 100
+# langdetect batches run in a worker pool only when every worker gets at least
+# this many sentences; smaller batches are cheaper to detect in-process
+POOL_MIN_SENTENCES_PER_WORKER = 50
+
+# Letters of the North Sami alphabet that Finnish does not use; š and ž are left
+# out because they appear in Finnish loanwords (Tšekki, šakki, Azerbaidžan)
+SAMI_CHARS = 'áčđŋŧÁČĐŊŦ'
+# A sentence is labelled Sami without detection only with at least this many
+# Sami letters, making up at least this share of its characters
+SAMI_MIN_CHARS = 2
+SAMI_CHAR_RATIO = 0.05
+
+def _looks_sami(sentence: str) -> bool:
+    """Check whether a sentence contains enough Sami letters to skip detection.
+
+    >>> _looks_sami('Mun lean Máhtte ja ásan Kárášjogas')
+    True
+    >>> _looks_sami('Tšekin presidentti vieraili Suomessa tänään')
+    False
+    >>> _looks_sami('Azerbaidžanin šakkimestari')
+    False
+    """
+    hits = sum(map(sentence.count, SAMI_CHARS))
+    return hits >= SAMI_MIN_CHARS and hits >= SAMI_CHAR_RATIO * len(sentence)
+
+def _safe_detect(sentence: str) -> str:
+    """Detect the language of a sentence, returning 'unknown' on failure."""
+    try:
+        return detect(sentence)
+    except Exception:
+        return 'unknown'
+
+@lru_cache(maxsize=None)
+def _load_fasttext_model():
+    """Load the fastText model, or return None if fasttext or the model is missing."""
+    if fasttext is None or not FASTTEXT_MODEL.exists():
+        return None
+    return fasttext.load_model(str(FASTTEXT_MODEL))
 
 class CorpusAnalyzer:
     def __init__(self, text: str):
         self.raw_text = text
-        self.sentences = self._split_into_sentences()
-        self.words = self._tokenize()
+        # Lowercased once and shared by everything that matches case-insensitively
+        self._lower_text = text.lower()
+        self.sentences, self.words, lengths = self._segment()
+        # Sentence lengths as a compact array, reused by all length statistics
+        self.sentence_lengths = np.fromiter(lengths, dtype=np.int32, count=len(lengths))
+        self.word_counts = Counter(self.words)
+
+    def _segment(self) -> Tuple[List[str], List[str], List[int]]:
+        """Split text into sentences and words in a single pass.
+
+        Returns the stripped non-empty sentences, the lowercased words of the
+        whole text and the word count of each sentence.
+        """
+        sentences = []
+        words = []
+        sentence_lengths = []
 
-    def _split_into_sentences(self) -> List[str]:
-        """Split text into sentences based on punctuation marks."""
         # Basic sentence splitting - can be improved with more sophisticated rules
-        sentences = re.split(r'[.!?]+', self.raw_text)
-        # Remove empty sentences and strip whitespace
-        return [s.strip() for s in sentences if s.strip()]
+        # Lowercasing never adds or removes terminators, so both splits line up
+        segments = zip(_SENT_SPLIT_RE.split(self.raw_text),
+                       _SENT_SPLIT_RE.split(self._lower_text))
+        for segment, lower_segment in segments:
+            # Split on whitespace and punctuation, lowercase all words
+            tokens = _WORD_RE.findall(lower_segment)
+            words.extend(tokens)
+
+            # Remove empty sentences and strip whitespace
+            sentence = segment.strip()
+            if sentence:
+                sentences.append(sentence)
+                # Lowercasing can split a word when it adds a combining mark
+                # (e.g. 'İ'), so count such sentences on the original text
+                if len(lower_segment) != len(segment):
+                    sentence_lengths.append(len(_WORD_RE.findall(segment)))
+                else:
+                    sentence_lengths.append(len(tokens))
 
-    def _tokenize(self) -> List[str]:
-        """Tokenize text into words."""
-        # Split on whitespace and punctuation, lowercase all words
-        words = re.findall(r'\b\w+\b', self.raw_text.lower())
-        return words
+        return sentences, words, sentence_lengths
 
     def basic_stats(self) -> Dict:
         """Calculate basic corpus statistics."""
         # Count total words, unique words, and sentences
-        total_words = len(self.words)
-        unique_words = len(set(self.words))
+        total_words = sum(self.word_counts.values())
+        unique_words = len(self.word_counts)
         total_sentences = len(self.sentences)
 
         # Calculate average sentence length
-        sentence_lengths = [len(re.findall(r'\b\w+\b', s)) for s in self.sentences]
-        avg_sentence_length = np.mean(sentence_lengths)
+        sentence_lengths = self.sentence_lengths
+        avg_sentence_length = sentence_lengths.mean()
         median_sentence_length = np.median(sentence_lengths)
 
         # Calculate type-token ratio
@@ -46,29 +129,78 @@ class CorpusAnalyzer:
             "average_sentence_length": round(avg_sentence_length, 2),
             "median_sentence_length": round(median_sentence_length, 2),
             "type_token_ratio": round(ttr, 4),
-            "sentence_length_std": round(np.std(sentence_lengths), 2)
+            "sentence_length_std": round(sentence_lengths.std(), 2)
         }
 
     def word_frequency(self, top_n: int = 20) -> List[Tuple[str, int]]:
         """Calculate word frequencies."""
-        return Counter(self.words).most_common(top_n)
+        counts = np.fromiter(self.word_counts.values(), dtype=np.int64,
+                             count=len(self.word_counts))
+        top_n = min(top_n, counts.size)
+        if top_n <= 0:
+            return []
+
+        # Partial selection of the top_n-th largest count instead of a heap
+        # over the whole vocabulary
+        kth = np.partition(counts, counts.size - top_n)[counts.size - top_n]
+        above = np.flatnonzero(counts > kth)
+        tied = np.flatnonzero(counts == kth)[:top_n - above.size]
+
+        # Order by count; ties keep first-seen order, as Counter.most_common does
+        top = np.concatenate((above, tied))
+        top = top[np.argsort(-counts[top], kind='stable')]
+
+        words = list(self.word_counts)
+        return [(words[i], int(counts[i])) for i in top]
 
     def sentence_length_distribution(self) -> Dict[int, int]:
         """Calculate distribution of sentence lengths."""
-        lengths = [len(re.findall(r'\b\w+\b', s)) for s in self.sentences]
-        return dict(Counter(lengths))
+        lengths, counts = np.unique(self.sentence_lengths, return_counts=True)
+        return dict(zip(lengths.tolist(), counts.tolist()))
 
     def detect_languages(self) -> Dict[str, int]:
         """Attempt to detect languages in the corpus."""
         language_counts = Counter()
 
-        # Try to detect language for each sentence
+        # Sentences with plenty of Sami letters are labelled directly, and
+        # sentences too short to detect count as unknown; neither detector
+        # needs to see them. The rest are truncated for both detectors alike.
+        remaining = []
         for sentence in self.sentences:
-            try:
-                lang = detect(sentence)
-                language_counts[lang] += 1
-            except:
+            if _looks_sami(sentence):
+                language_counts['se'] += 1
+            elif len(sentence) < MIN_DETECT_CHARS:
                 language_counts['unknown'] += 1
+            else:
+                remaining.append(sentence[:MAX_DETECT_CHARS])
+
+        # Subtitles repeat a lot (credits, stock phrases), so sentences are
+        # detected once per distinct prefix and the label reused for repeats
+        keys = [sentence[:DETECT_KEY_CHARS] for sentence in remaining]
+        representatives = {}
+        for key, sentence in zip(keys, remaining):
+            representatives.setdefault(key, sentence)
+        unique_sentences = list(representatives.values())
+
+        model = _load_fasttext_model()
+        workers = os.cpu_count() or 1
+        if model is not None:
+            # fastText labels the whole batch in one native call; it expects
+            # single lines, so fold any newlines left inside sentences
+            labels, _ = model.predict([s.replace('\n', ' ') for s in unique_sentences], k=1)
+            languages = [label[0][len('__label__'):] for label in labels]
+        elif workers == 1 or len(unique_sentences) < workers * POOL_MIN_SENTENCES_PER_WORKER:
+            # Too few cores or sentences to pay for starting worker processes
+            languages = [_safe_detect(sentence) for sentence in unique_sentences]
+        else:
+            # Detection is independent per sentence, so spread it over all cores;
+            # about four chunks per worker keeps them all busy to the end
+            chunksize = max(1, len(unique_sentences) // (workers * 4))
+            with Pool(workers) as pool:
+                languages = pool.map(_safe_detect, unique_sentences, chunksize=chunksize)
+
+        cache = dict(zip(representatives, languages))
+        language_counts.update(cache[key] for key in keys)
 
         return dict(language_counts)
 
@@ -104,17 +236,31 @@ def analyze_corpus(text_content: str):
     analyzer = CorpusAnalyzer(text_content)
     print(analyzer.generate_report())
 
-    # Additional analysis: create visualizations using pandas
+    # Additional analysis: summary of the sentence length distribution
     stats = analyzer.basic_stats()
     length_dist = analyzer.sentence_length_distribution()
 
-    # Convert sentence length distribution to DataFrame for easier analysis
-    df_lengths = pd.DataFrame.from_dict(length_dist,
-                                      orient='index',
-                                      columns=['count'])
+    # Number of sentences per length, summarized like DataFrame.describe()
+    counts = np.array(list(length_dist.values()), dtype=float)
+    if counts.size:
+        std = counts.std(ddof=1) if counts.size > 1 else np.nan
+        summary = [counts.size, counts.mean(), std, counts.min(),
+                   *np.percentile(counts, [25, 50, 75]), counts.max()]
+    else:
+        summary = [0] + [np.nan] * 7
+    labels = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    values = ['NaN' if np.isnan(value) else f"{value:.6f}" for value in summary]
+    # Drop trailing zeros shared by the whole column, keeping one decimal
+    numbers = [value for value in values if value != 'NaN']
+    while all(value.endswith('0') and not value.endswith('.0') for value in numbers):
+        numbers = [value[:-1] for value in numbers]
+        values = [value if value == 'NaN' else value[:-1] for value in values]
+    width = max(len('count'), *map(len, values))
 
     print("\nSentence Length Statistics:")
-    print(df_lengths.describe())
+    print(f"{'':5}  {'count':>{width}}")
+    for label, value in zip(labels, values):
+        print(f"{label:<5}  {value:>{width}}")
 
     return analyzer
 
@@ -1,13 +1,21 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+_HTML_RE = re.compile(r'<[^>]+>')
+
 def clean_subtitle_text(text):
     """Clean subtitle text by removing HTML tags and normalizing whitespace."""
-    # Remove HTML tags if present
-    text = re.sub(r'<[^>]+>', '', text)
-    # Replace multiple spaces and newlines with single space
-    text = ' '.join(text.split())
-    return text.strip()
+    # Remove HTML tags if present; most subtitles have none, so skip the regex
+    if '<' in text:
+        text = _HTML_RE.sub('', text)
+    # Replace multiple spaces and newlines with single space, unless the text is
+    # already normalized (isprintable() rules out every whitespace but ' ')
+    if (not text.isprintable() or '  ' in text
+            or text.startswith(' ') or text.endswith(' ')):
+        text = ' '.join(text.split())
+    return text
 
 def process_srt_file(file_path):
     """Extract text content from SRT file, returning list of cleaned subtitle texts."""
@@ -15,76 +23,78 @@ def process_srt_file(file_path):
     current_text = []
     in_subtitle_text = False
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-
-                # Skip empty lines and numeric identifiers
-                if not line:
-                    if current_text:  # End of a subtitle block
-                        text = clean_subtitle_text(' '.join(current_text))
-                        if text:  # Only add non-empty texts
-                            subtitle_texts.append(text)
-                        current_text = []
-                    in_subtitle_text = False
-                    continue
-
-                # Skip timestamp lines
-                if '-->' in line:
-                    in_subtitle_text = True
-                    continue
-
-                # Skip numeric identifiers (usually just a number)
-                if line.isdigit():
-                    continue
-
-                # If we're in the text part of a subtitle, add the line
-                if in_subtitle_text:
-                    current_text.append(line)
+    def flush():
+        if current_text:  # End of a subtitle block
+            text = clean_subtitle_text(' '.join(current_text))
+            if text:  # Only add non-empty texts
+                subtitle_texts.append(text)
+            current_text.clear()
 
+    try:
+        # Decode the whole file at once; undecodable bytes become U+FFFD
+        with open(file_path, 'rb') as f:
+            content = f.read().decode('utf-8', errors='replace')
     except Exception as e:
         print(f"Error processing {file_path}: {str(e)}")
         return []
 
+    # splitlines() also handles CRLF and bare CR line endings
+    for line in content.splitlines():
+        line = line.strip()
+
+        # Empty lines end a subtitle block
+        if not line:
+            flush()
+            in_subtitle_text = False
+
+        # Timestamp lines start a subtitle block, and also end the previous
+        # one when no blank line separates them
+        elif '-->' in line:
+            if current_text:
+                # The last line before the timestamp is the next cue's id
+                if current_text[-1].isdigit():
+                    current_text.pop()
+                flush()
+            in_subtitle_text = True
+
+        # If we're in the text part of a subtitle, add the line; numeric
+        # identifiers come before the timestamp and are skipped here
+        elif in_subtitle_text:
+            current_text.append(line)
+
     # Add the last subtitle if there is one
-    if current_text:
-        text = clean_subtitle_text(' '.join(current_text))
-        if text:
-            subtitle_texts.append(text)
+    flush()
 
     return subtitle_texts
 
 def process_srt_directory(input_dir, output_file):
     """Process all SRT files in directory and combine into single output file."""
     input_path = Path(input_dir)
-    srt_files = list(input_path.glob('*.srt'))
+    srt_files = [
+        Path(entry.path) for entry in os.scandir(input_path)
+        if entry.is_file() and entry.name.lower().endswith('.srt')
+    ]
 
     if not srt_files:
         print("No SRT files found in the directory!")
         return
 
     print(f"Found {len(srt_files)} SRT files")
-    all_subtitles = []
-
-    # Process each SRT file
-    for srt_file in srt_files:
-        print(f"Processing: {srt_file.name}")
-        subtitles = process_srt_file(srt_file)
-        all_subtitles.extend(subtitles)
-
-    # Remove duplicates while preserving order
     seen = set()
-    unique_subtitles = [x for x in all_subtitles if not (x in seen or seen.add(x))]
 
-    # Write to output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for subtitle in unique_subtitles:
-            if subtitle:  # Extra check to ensure no empty lines
-                f.write(subtitle + '\n')
+    # Process the SRT files in parallel; results come back in file order, and
+    # each file's subtitles are written out as soon as they arrive
+    with open(output_file, 'w', encoding='utf-8') as f, ProcessPoolExecutor() as executor:
+        for srt_file, subtitles in zip(srt_files, executor.map(process_srt_file, srt_files)):
+            print(f"Processed: {srt_file.name}")
+            for subtitle in subtitles:
+                # Skip duplicates while preserving order
+                if subtitle not in seen:
+                    seen.add(subtitle)
+                    f.write(subtitle + '\n')
 
     print(f"\nProcessing complete!")
-    print(f"Total subtitles extracted: {len(unique_subtitles)}")
+    print(f"Total subtitles extracted: {len(seen)}")
     print(f"Output written to: {output_file}")
 
 def main():
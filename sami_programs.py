@@ -1,34 +1,45 @@
+import os
 import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import json
 import re
 
-def get_subtitle_info(video_file):
-    """Get subtitle track information from video file using ffprobe."""
+def extract_video_subtitles(video_file, output_file):
+    """Extract the first subtitle stream of a single video file into output_file."""
+    print(f"\nProcessing file: {video_file.name}")
+
+    # ffmpeg would refuse to overwrite it and report a generic error
+    if output_file.exists():
+        print(f"Skipping {video_file.name}: {output_file.name} already exists")
+        return
+
+    # Extract subtitles using ffmpeg with subtitle transcoding; a single run
+    # both finds the subtitle stream and converts it, so no ffprobe pass is needed
     cmd = [
-        'ffprobe',
-        '-v', 'quiet',
-        '-print_format', 'json',
-        '-show_streams',
-        str(video_file)
+        'ffmpeg',
+        '-nostdin',  # Never wait for terminal input when running in parallel
+        '-v', 'error',  # Only log errors, keeps the captured stderr small
+        '-i', str(video_file),
+        '-map', '0:s:0?',  # First subtitle stream, if the file has one
+        '-c:s', 'srt',
+        '-f', 'srt',  # Force SRT format output
+        str(output_file)
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"Error analyzing {video_file}: {result.stderr}")
-            return None
-
-        data = json.loads(result.stdout)
-        # Find subtitle streams
-        subtitle_streams = [
-            stream for stream in data['streams']
-            if stream['codec_type'] == 'subtitle'
-        ]
-        return subtitle_streams
+        print(f"Extracting subtitles to: {output_file.name}")
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+
+        # Without a subtitle stream the output has no streams and ffmpeg fails
+        if result.returncode == 0:
+            print(f"Successfully extracted subtitles from {video_file.name}")
+        else:
+            print(f"No subtitles extracted from {video_file.name}: {result.stderr}")
+
     except Exception as e:
-        print(f"Error processing {video_file}: {str(e)}")
-        return None
+        print(f"Error processing subtitle extraction: {str(e)}")
 
 def extract_subtitles(input_dir, output_dir=None):
     """Extract subtitles from all video files in the input directory."""
@@ -41,52 +52,35 @@ def extract_subtitles(input_dir, output_dir=None):
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Get all video files
-    video_files = list(input_path.glob('*.mp4')) + list(input_path.glob('*.mkv'))
+    # Get all video files in a single directory scan
+    video_files = [
+        Path(entry.path) for entry in os.scandir(input_path)
+        if entry.is_file() and entry.name.lower().endswith(('.mp4', '.mkv'))
+    ]
     total_files = len(video_files)
 
     print(f"Found {total_files} video files")
 
-    # Process each file
-    for index, video_file in enumerate(video_files, 1):
-        print(f"\nProcessing file {index}/{total_files}: {video_file.name}")
-
-        # Get subtitle information
-        subtitle_streams = get_subtitle_info(video_file)
-        if not subtitle_streams:
-            print(f"No subtitle streams found in {video_file.name}")
-            continue
-
-        # Create base filename without extension
-        base_name = video_file.stem
-
-        # Extract each subtitle stream
-        for stream in subtitle_streams:
-            stream_index = stream['index']
-
-            # Create output filename
-            output_file = output_path / f"{base_name}.srt"
-
-            # Extract subtitles using ffmpeg with subtitle transcoding
-            cmd = [
-                'ffmpeg',
-                '-i', str(video_file),
-                '-map', f'0:{stream_index}',
-                '-f', 'srt',  # Force SRT format output
-                str(output_file)
-            ]
-
-            try:
-                print(f"Extracting subtitles to: {output_file.name}")
-                result = subprocess.run(cmd, capture_output=True, text=True)
-
-                if result.returncode == 0:
-                    print(f"Successfully extracted subtitles from stream {stream_index}")
-                else:
-                    print(f"Error extracting subtitles: {result.stderr}")
-
-            except Exception as e:
-                print(f"Error processing subtitle extraction: {str(e)}")
+    # Name outputs after the video without its extension, unless another
+    # video shares the name (x.mp4 and x.mkv), which would race on x.srt
+    stem_counts = Counter(video_file.stem.lower() for video_file in video_files)
+    output_files = {
+        video_file: output_path / (
+            f"{video_file.stem}.srt" if stem_counts[video_file.stem.lower()] == 1
+            else f"{video_file.name}.srt"
+        )
+        for video_file in video_files
+    }
+
+    # ffmpeg runs out of process, so threads are enough to keep several busy
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(extract_video_subtitles, video_file, output_file): video_file
+            for video_file, output_file in output_files.items()
+        }
+        for index, future in enumerate(as_completed(futures), 1):
+            future.result()
+            print(f"Finished file {index}/{total_files}: {futures[future].name}")
 
 def main():
     # Get the directory containing the script